@@ -1,3 +1,6 @@
+import hashlib
+from pathlib import Path
+
 import nox
 
 
@@ -5,5 +8,10 @@ import nox
 # e.g. list[Path] is not supported
 @nox.session(python=["3.9", "3.10", "3.11"])
 def tests(session):
-    session.run("poetry", "install", external=True)
+    # only reinstall the dependencies if the lockfile changed since the last run
+    lock_hash = hashlib.sha256(Path("poetry.lock").read_bytes()).hexdigest()
+    stamp_path = Path(session.virtualenv.location) / ".poetry_lock_hash"
+    if not stamp_path.exists() or stamp_path.read_text() != lock_hash:
+        session.run("poetry", "install", external=True)
+        stamp_path.write_text(lock_hash)
     session.run("pytest")
@@ -1,26 +1,65 @@
-import datetime
+import os
+import re
+import stat
+import sys
+from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Annotated, List, Optional, Union
 
 import typer
 from rich import print
-from typing_extensions import Annotated
-
-from beneuro_data.config import _get_env_path, _get_package_path, _load_config
-from beneuro_data.data_transfer import download_raw_session, upload_raw_session
-from beneuro_data.data_validation import validate_raw_session
-from beneuro_data.extra_file_handling import rename_extra_files_in_session
-from beneuro_data.query_sessions import (
-    get_last_session_path,
-    list_all_sessions_on_day,
-    list_subject_sessions_on_day,
-)
-from beneuro_data.update_bnd import check_for_updates, update_bnd
-from beneuro_data.video_renaming import rename_raw_videos_of_session
+from rich.console import Console
 
 app = typer.Typer()
 
 
+class ProcessingLevel(str, Enum):
+    """
+    Processing levels the commands can work with.
+
+    Only raw data is supported for now.
+    """
+
+    raw = "raw"
+
+
+class ListedProcessingLevel(str, Enum):
+    """
+    Processing levels sessions can be listed at.
+    """
+
+    raw = "raw"
+    processed = "processed"
+
+
+# session folder names are the subject's name followed by the date and time
+# e.g. M017_2024_03_12_18_45
+_SESSION_NAME_REGEX = re.compile(r"(?P<subject_name>.+?)_[0-9]{4}(_[0-9]{2}){4}")
+
+# upper limit on the number of sessions validated at the same time
+_MAX_VALIDATION_WORKERS = 16
+
+# entries in a subject's folder that are never sessions
+# (hidden ones starting with a dot are skipped as well)
+_NON_SESSION_NAMES = frozenset({"__pycache__", "Thumbs.db", "desktop.ini"})
+
+# options shared by the validation commands
+_CHECK_BEHAVIOR_OPTION = typer.Option(
+    "--check-behavior/--ignore-behavior", help="Check behavioral data or not."
+)
+_CHECK_EPHYS_OPTION = typer.Option(
+    "--check-ephys/--ignore-ephys", help="Check ephys data or not."
+)
+_CHECK_VIDEOS_OPTION = typer.Option(
+    "--check-videos/--ignore-videos", help="Check videos data or not."
+)
+
+# prints the per-session status lines
+# styles are passed directly, so the lines don't go through rich's markup parsing
+_console = Console(highlight=False, soft_wrap=True)
+
+
 @app.command()
 def to_nwb(
     local_session_path: Annotated[
@@ -88,34 +127,25 @@ def to_nwb(
     Running Kilosort on only selected probes:
         `bnd to-nwb . M037 --sort-probe imec0 --sort-probe imec1`
     """
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_validation import _get_ap_stream_names_of_probes
+
     # this will throw an error if the dependencies are not available
     from beneuro_data.conversion.convert_to_nwb import convert_to_nwb
 
     config = _load_config()
 
-    if not local_session_path.absolute().is_dir():
-        raise ValueError("Session path must be a directory.")
-    if not local_session_path.absolute().exists():
-        raise ValueError("Session path does not exist.")
-    if not local_session_path.absolute().is_relative_to(config.LOCAL_PATH):
-        raise ValueError("Session path must be inside the local root folder.")
+    local_session_path = _check_local_session_dir(local_session_path, config.LOCAL_PATH)
 
     if len(sort_probe) != 0:
-        if len(set(sort_probe)) != len(sort_probe):
-            raise ValueError(f"Duplicate probe names found in {sort_probe}.")
-        # append .ap to each probe name
-        stream_names_to_process = [f"{probe}.ap" for probe in sort_probe]
-        # check that they are all in the session folder somewhere
-        for stream_name in stream_names_to_process:
-            if len(list(local_session_path.glob(f"**/*{stream_name}.bin"))) == 0:
-                raise ValueError(
-                    f"No file found for {stream_name} in {local_session_path.absolute()}"
-                )
+        stream_names_to_process = _get_ap_stream_names_of_probes(
+            local_session_path, sort_probe
+        )
     else:
         stream_names_to_process = None
 
     convert_to_nwb(
-        local_session_path.absolute(),
+        local_session_path,
         subject_name,
         config.LOCAL_PATH,
         config.WHITELISTED_FILES_IN_ROOT,
@@ -162,8 +192,9 @@ def download_last(
     #    ),
     # ] = True,
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
 ):
     """
     Download (raw) experimental data in the last session of a subject from the remote server.
@@ -171,12 +202,13 @@ def download_last(
     Example usage:
         `bnd upload-last M017`
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_transfer import download_raw_session
+    from beneuro_data.query_sessions import get_last_session_path
 
     config = _load_config()
 
-    subject_path = config.REMOTE_PATH / processing_level / subject_name
+    subject_path = _subject_path(config.REMOTE_PATH, processing_level.value, subject_name)
 
     # first get the last valid session
     # and ask the user if this is really the session they want to upload
@@ -189,14 +221,11 @@ def download_last(
 
     # then ask the user if they want to include behavior, ephys, and videos
     # only ask the ones that are not specified as a CLI option
-    if include_behavior is None:
-        include_behavior = typer.confirm("Include behavior?")
-    if include_ephys is None:
-        include_ephys = typer.confirm("Include ephys?")
-    if include_videos is None:
-        include_videos = typer.confirm("Include videos?")
-
-    if all([not include_behavior, not include_ephys, not include_videos]):
+    include_behavior, include_ephys, include_videos = _prompt_for_data_types(
+        include_behavior, include_ephys, include_videos
+    )
+
+    if not (include_behavior or include_ephys or include_videos):
         raise ValueError("At least one data type must be included.")
 
     download_raw_session(
@@ -259,8 +288,9 @@ def download_session(
     #    ),
     # ] = True,
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
 ):
     """
     Download (raw) experimental data in a given session from the remote server.
@@ -268,10 +298,10 @@ def download_session(
     Example usage after navigating to session folder on RDS:
         `bnd download-session . M017`
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_transfer import download_raw_session
 
-    if all([not include_behavior, not include_ephys, not include_videos]):
+    if not (include_behavior or include_ephys or include_videos):
         raise ValueError("At least one data type must be included.")
 
     config = _load_config()
@@ -321,8 +351,9 @@ def dl(
         ),
     ] = False,
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
 ):
     """
     Download (raw) experimental data from a given session from the remote server.
@@ -330,17 +361,25 @@ def dl(
     Example usage to download everything:
         `bnd dl M017_2024_03_12_18_45 -ev`
     """
-    animal = session_name[:4]
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_transfer import download_raw_session
 
-    if all([not include_behavior, not include_ephys, not include_videos]):
+    animal = _subject_name_of_session(session_name)
+    if animal is None:
+        raise typer.BadParameter(
+            f"{session_name} is not a session name like M017_2024_03_12_18_45"
+        )
+
+    if not (include_behavior or include_ephys or include_videos):
         raise ValueError("At least one data type must be included.")
 
     config = _load_config()
 
     download_raw_session(
-        remote_session_path=config.REMOTE_PATH / processing_level / animal / session_name,
+        remote_session_path=_subject_path(
+            config.REMOTE_PATH, processing_level.value, animal
+        )
+        / session_name,
         subject_name=animal,
         local_base_path=config.LOCAL_PATH,
         remote_base_path=config.REMOTE_PATH,
@@ -405,34 +444,23 @@ def kilosort_session(
     Suppressing output:
         `bnd kilosort-session . M020 --no-verbose`
     """
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_validation import _get_ap_stream_names_of_probes
+
     # this will throw an error if the dependencies are not available
     from beneuro_data.spike_sorting import run_kilosort_on_session_and_save_in_processed
 
     config = _load_config()
 
-    if not local_session_path.absolute().is_dir():
-        raise ValueError("Session path must be a directory.")
-    if not local_session_path.absolute().exists():
-        raise ValueError("Session path does not exist.")
-    if not local_session_path.absolute().is_relative_to(config.LOCAL_PATH):
-        raise ValueError("Session path must be inside the local root folder.")
+    local_session_path = _check_local_session_dir(local_session_path, config.LOCAL_PATH)
 
     if len(probes) != 0:
-        if len(set(probes)) != len(probes):
-            raise ValueError(f"Duplicate probe names found in {probes}.")
-        # append .ap to each probe name
-        stream_names_to_process = [f"{probe}.ap" for probe in probes]
-        # check that they are all in the session folder somewhere
-        for stream_name in stream_names_to_process:
-            if len(list(local_session_path.glob(f"**/*{stream_name}.bin"))) == 0:
-                raise ValueError(
-                    f"No file found for {stream_name} in {local_session_path.absolute()}"
-                )
+        stream_names_to_process = _get_ap_stream_names_of_probes(local_session_path, probes)
     else:
         stream_names_to_process = None
 
     run_kilosort_on_session_and_save_in_processed(
-        local_session_path.absolute(),
+        local_session_path,
         subject_name,
         config.LOCAL_PATH,
         config.EXTENSIONS_TO_RENAME_AND_UPLOAD,
@@ -445,7 +473,14 @@ def kilosort_session(
 @app.command()
 def validate_session(
     session_path: Annotated[
-        Path, typer.Argument(help="Path to session directory. Can be relative or absolute")
+        Path,
+        typer.Argument(
+            help="Path to session directory. Can be relative or absolute",
+            exists=True,
+            file_okay=False,
+            dir_okay=True,
+            resolve_path=True,
+        ),
     ],
     subject_name: Annotated[
         str,
@@ -454,22 +489,12 @@ def validate_session(
         ),
     ],
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
-    check_behavior: Annotated[
-        bool,
-        typer.Option(
-            "--check-behavior/--ignore-behavior", help="Check behavioral data or not."
-        ),
-    ] = True,
-    check_ephys: Annotated[
-        bool,
-        typer.Option("--check-ephys/--ignore-ephys", help="Check ephys data or not."),
-    ] = True,
-    check_videos: Annotated[
-        bool,
-        typer.Option("--check-videos/--ignore-videos", help="Check videos data or not."),
-    ] = True,
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
+    check_behavior: Annotated[bool, _CHECK_BEHAVIOR_OPTION] = True,
+    check_ephys: Annotated[bool, _CHECK_EPHYS_OPTION] = True,
+    check_videos: Annotated[bool, _CHECK_VIDEOS_OPTION] = True,
 ):
     """
     Validate experimental data in a given session.
@@ -478,21 +503,18 @@ def validate_session(
 
         `bnd validate-session . M017`
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_validation import validate_raw_session
 
-    if all([not check_behavior, not check_ephys, not check_videos]):
+    if not (check_behavior or check_ephys or check_videos):
         raise ValueError("At least one data type must be checked.")
 
-    if not session_path.absolute().is_dir():
-        raise ValueError("Session path must be a directory.")
-    if not session_path.absolute().exists():
-        raise ValueError("Session path does not exist.")
-
+    # typer already made sure that session_path is an existing directory
+    # and resolved it to an absolute path
     config = _load_config()
 
     validate_raw_session(
-        session_path.absolute(),
+        session_path,
         subject_name,
         check_behavior,
         check_ephys,
@@ -511,26 +533,16 @@ def validate_last(
         ),
     ],
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
     check_locally: Annotated[
         bool,
         typer.Option("--local/--remote", help="Check local or remote data."),
     ] = True,
-    check_behavior: Annotated[
-        bool,
-        typer.Option(
-            "--check-behavior/--ignore-behavior", help="Check behavioral data or not."
-        ),
-    ] = True,
-    check_ephys: Annotated[
-        bool,
-        typer.Option("--check-ephys/--ignore-ephys", help="Check ephys data or not."),
-    ] = True,
-    check_videos: Annotated[
-        bool,
-        typer.Option("--check-videos/--ignore-videos", help="Check videos data or not."),
-    ] = True,
+    check_behavior: Annotated[bool, _CHECK_BEHAVIOR_OPTION] = True,
+    check_ephys: Annotated[bool, _CHECK_EPHYS_OPTION] = True,
+    check_videos: Annotated[bool, _CHECK_VIDEOS_OPTION] = True,
 ):
     """
     Validate experimental data in the last session of a subject.
@@ -538,17 +550,18 @@ def validate_last(
     Example usage:
         `bnd validate-last M017`
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_validation import validate_raw_session
+    from beneuro_data.query_sessions import get_last_session_path
 
-    if all([not check_behavior, not check_ephys, not check_videos]):
+    if not (check_behavior or check_ephys or check_videos):
         raise ValueError("At least one data type must be checked.")
 
     config = _load_config()
 
     root_path = config.LOCAL_PATH if check_locally else config.REMOTE_PATH
 
-    subject_path = root_path / processing_level / subject_name
+    subject_path = _subject_path(root_path, processing_level.value, subject_name)
 
     # get the last valid session
     last_session_path = get_last_session_path(subject_path, subject_name).absolute()
@@ -578,8 +591,9 @@ def rename_videos(
         ),
     ],
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
     verbose: Annotated[
         bool,
         typer.Option(help="Print the list of files that were renamed."),
@@ -594,16 +608,14 @@ def rename_videos(
 
         `bnd rename-videos /absolute/path/to/session M017 --verbose`
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.video_renaming import rename_raw_videos_of_session
 
-    if not session_path.absolute().is_dir():
-        raise ValueError("Session path must be a directory.")
-    if not session_path.absolute().exists():
-        raise ValueError("Session path does not exist.")
+    session_path = session_path.absolute()
+
+    _check_session_dir(session_path)
 
     rename_raw_videos_of_session(
-        session_path.absolute(),
+        session_path,
         subject_name,
         verbose,
     )
@@ -630,17 +642,19 @@ def rename_extra_files(
 
         `bnd rename-extra-files /absolute/path/to/session M017`
     """
-    if not session_path.absolute().is_dir():
-        raise ValueError("Session path must be a directory.")
-    if not session_path.absolute().exists():
-        raise ValueError("Session path does not exist.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.extra_file_handling import rename_extra_files_in_session
+
+    session_path = session_path.absolute()
+
+    _check_session_dir(session_path)
 
     config = _load_config()
 
     rename_extra_files_in_session(
-        session_path.absolute(),
-        tuple(config.WHITELISTED_FILES_IN_ROOT),
-        tuple(config.EXTENSIONS_TO_RENAME_AND_UPLOAD),
+        session_path,
+        config.WHITELISTED_FILES_IN_ROOT,
+        config.EXTENSIONS_TO_RENAME_AND_UPLOAD,
     )
 
 
@@ -699,8 +713,9 @@ def upload_session(
         ),
     ] = True,
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
 ):
     """
     Upload (raw) experimental data in a given session to the remote server.
@@ -708,20 +723,13 @@ def upload_session(
     Example usage:
         `bnd upload-session . M017`
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_transfer import upload_raw_session
 
-    if all([not include_behavior, not include_ephys, not include_videos]):
+    if not (include_behavior or include_ephys or include_videos):
         raise ValueError("At least one data type must be included.")
 
-    # if videos are included, rename them first if not specified otherwise
-    if rename_videos_first is None:
-        rename_videos_first = include_videos
-
-    if rename_videos_first and not include_videos:
-        raise ValueError(
-            "Do not rename videos if you're not uploading them. (Meaning --ignore-videos and --rename-videos are not allowed together.)"
-        )
+    rename_videos_first = _resolve_rename_flags(include_videos, rename_videos_first)
 
     config = _load_config()
 
@@ -794,8 +802,9 @@ def up(
         ),
     ] = True,
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
 ):
     """
     Upload (raw) experimental data to the remote server.
@@ -805,28 +814,26 @@ def up(
     Example to upload the videos and ephys of the last session of a subject:
         `bnd up M017 -evB`
     """
-    animal = session_or_animal_name[:4]
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_transfer import upload_raw_session
 
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    session_subject_name = _subject_name_of_session(session_or_animal_name)
+    if session_subject_name is not None:
+        animal = session_subject_name
+    else:
+        animal = session_or_animal_name
 
-    if all([not include_behavior, not include_ephys, not include_videos]):
+    if not (include_behavior or include_ephys or include_videos):
         raise ValueError("At least one data type must be included.")
 
-    # if videos are included, rename them first if not specified otherwise
-    if rename_videos_first is None:
-        rename_videos_first = include_videos
-
-    if rename_videos_first and not include_videos:
-        raise ValueError(
-            "Do not rename videos if you're not uploading them. (Meaning --ignore-videos and --rename-videos are not allowed together.)"
-        )
+    rename_videos_first = _resolve_rename_flags(include_videos, rename_videos_first)
 
     config = _load_config()
 
-    if len(session_or_animal_name) > 4:  # session name is given
+    if session_subject_name is not None:  # session name is given
         up_done = upload_raw_session(
-            config.LOCAL_PATH / processing_level / animal / session_or_animal_name,
+            _subject_path(config.LOCAL_PATH, processing_level.value, animal)
+            / session_or_animal_name,
             animal,
             config.LOCAL_PATH,
             config.REMOTE_PATH,
@@ -907,8 +914,9 @@ def upload_last(
         ),
     ] = True,
     processing_level: Annotated[
-        str, typer.Argument(help="Processing level of the session. raw or processed.")
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
 ):
     """
     Upload (raw) experimental data in the last session of a subject to the remote server.
@@ -916,12 +924,13 @@ def upload_last(
     Example usage:
         `bnd upload-last M017`
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    from beneuro_data.config import _load_config
+    from beneuro_data.data_transfer import upload_raw_session
+    from beneuro_data.query_sessions import get_last_session_path
 
     config = _load_config()
 
-    subject_path = config.LOCAL_PATH / processing_level / subject_name
+    subject_path = _subject_path(config.LOCAL_PATH, processing_level.value, subject_name)
 
     # first get the last valid session
     # and ask the user if this is really the session they want to upload
@@ -934,24 +943,14 @@ def upload_last(
 
     # then ask the user if they want to include behavior, ephys, and videos
     # only ask the ones that are not specified as a CLI option
-    if include_behavior is None:
-        include_behavior = typer.confirm("Include behavior?")
-    if include_ephys is None:
-        include_ephys = typer.confirm("Include ephys?")
-    if include_videos is None:
-        include_videos = typer.confirm("Include videos?")
-
-    if all([not include_behavior, not include_ephys, not include_videos]):
+    include_behavior, include_ephys, include_videos = _prompt_for_data_types(
+        include_behavior, include_ephys, include_videos
+    )
+
+    if not (include_behavior or include_ephys or include_videos):
         raise ValueError("At least one data type must be included.")
 
-    # if videos are included, rename them first if not specified otherwise
-    if rename_videos_first is None:
-        rename_videos_first = include_videos
-
-    if rename_videos_first and not include_videos:
-        raise ValueError(
-            "Do not rename videos if you're not uploading them. (Meaning --ignore-videos and --rename-videos are not allowed together.)"
-        )
+    rename_videos_first = _resolve_rename_flags(include_videos, rename_videos_first)
 
     upload_raw_session(
         last_session_path,
@@ -975,85 +974,87 @@ def upload_last(
 def validate_sessions(
     subject_name: Annotated[str, typer.Argument(help="Subject name.")],
     processing_level: Annotated[
-        str,
-        typer.Argument(help="Processing level of the session. raw or processed."),
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
     ],
     check_locally: Annotated[
         bool,
         typer.Option("--local/--remote", help="Check local or remote data."),
     ] = True,
-    check_behavior: Annotated[
-        bool,
-        typer.Option(
-            "--check-behavior/--ignore-behavior", help="Check behavioral data or not."
-        ),
-    ] = True,
-    check_ephys: Annotated[
-        bool,
-        typer.Option("--check-ephys/--ignore-ephys", help="Check ephys data or not."),
-    ] = True,
-    check_videos: Annotated[
-        bool,
-        typer.Option("--check-videos/--ignore-videos", help="Check videos data or not."),
-    ] = True,
+    check_behavior: Annotated[bool, _CHECK_BEHAVIOR_OPTION] = True,
+    check_ephys: Annotated[bool, _CHECK_EPHYS_OPTION] = True,
+    check_videos: Annotated[bool, _CHECK_VIDEOS_OPTION] = True,
     rename_videos_first: Annotated[
         bool,
         typer.Option(
             "--rename-videos/--no-rename-videos",
-            help="Rename videos before validating and uploading.",
+            help="Rename videos before validating. Only done if videos are checked. Off by default, so that validating doesn't modify the sessions.",
         ),
-    ] = True,
+    ] = False,
     rename_extra_files_first: Annotated[
         bool,
         typer.Option(
             "--rename-extra-files/--no-rename-extra-files",
-            help="Rename extra files (e.g. comment.txt) before validating and uploading.",
+            help="Rename extra files (e.g. comment.txt) before validating. Off by default, so that validating doesn't modify the sessions.",
         ),
-    ] = True,
+    ] = False,
+    fail_fast: Annotated[
+        bool,
+        typer.Option(help="Stop at the first session that fails validation."),
+    ] = False,
 ):
     """
     Validate (raw) experimental data in all sessions of a given subject.
 
     See options for which data to check and ignore.
-    """
 
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    \b
+    Stop at the first invalid session:
+        `bnd validate-sessions M017 raw --fail-fast`
 
-    if all([not check_behavior, not check_ephys, not check_videos]):
+    \b
+    Rename the videos and extra files before validating them:
+        `bnd validate-sessions M017 raw --rename-videos --rename-extra-files`
+    """
+    from beneuro_data.config import _load_config
+
+    if not (check_behavior or check_ephys or check_videos):
         raise ValueError("At least one data type must be checked.")
 
     config = _load_config()
 
     root_path = config.LOCAL_PATH if check_locally else config.REMOTE_PATH
-    subject_path = root_path / processing_level / subject_name
-
-    for session_path in subject_path.iterdir():
-        if session_path.is_dir():
-            try:
-                validate_raw_session(
-                    session_path,
-                    subject_name,
-                    check_behavior,
-                    check_ephys,
-                    check_videos,
-                    config.WHITELISTED_FILES_IN_ROOT,
-                    config.EXTENSIONS_TO_RENAME_AND_UPLOAD,
-                    rename_videos_first,
-                    rename_extra_files_first,
-                )
-            except Exception as e:
-                print(f"[bold red]Problem with {session_path.name}: {e.args[0]}\n")
-            else:
-                print(f"[bold green]{session_path.name} looking good.\n")
+    subject_path = _subject_path(root_path, processing_level.value, subject_name)
+
+    # hidden and other known non-session entries are skipped based on their name alone
+    with os.scandir(subject_path) as entries:
+        session_paths = [
+            entry.path
+            for entry in entries
+            if not entry.name.startswith(".")
+            and entry.name not in _NON_SESSION_NAMES
+            and entry.is_dir(follow_symlinks=False)
+        ]
+
+    _validate_sessions_concurrently(
+        [(session_path, subject_name) for session_path in session_paths],
+        check_behavior,
+        check_ephys,
+        check_videos,
+        config.WHITELISTED_FILES_IN_ROOT,
+        config.EXTENSIONS_TO_RENAME_AND_UPLOAD,
+        fail_fast,
+        rename_videos_first=rename_videos_first and check_videos,
+        rename_extra_files_first=rename_extra_files_first,
+    )
 
 
 @app.command()
 def list_today(
     processing_level: Annotated[
-        str,
-        typer.Argument(help="Processing level of the session. raw or processed."),
-    ] = "raw",
+        ListedProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ListedProcessingLevel.raw,
     check_locally: Annotated[
         bool,
         typer.Option("--local/--remote", help="Check local or remote data."),
@@ -1062,88 +1063,79 @@ def list_today(
     """
     List all sessions of all subjects that happened today.
     """
-    if processing_level not in ["raw", "processed"]:
-        raise ValueError("Processing level must be raw or processed.")
+    import datetime
+
+    from beneuro_data.config import _load_config
+    from beneuro_data.query_sessions import iter_all_sessions_on_day
 
     config = _load_config()
     root_path = config.LOCAL_PATH if check_locally else config.REMOTE_PATH
 
-    raw_or_processed_path = root_path / processing_level
+    raw_or_processed_path = root_path / processing_level.value
     if not raw_or_processed_path.exists():
         raise FileNotFoundError(f"{raw_or_processed_path} found.")
 
     today = datetime.datetime.today()
 
-    todays_sessions_with_subject = list_all_sessions_on_day(
+    todays_sessions_with_subject = iter_all_sessions_on_day(
         raw_or_processed_path, today, config.IGNORED_SUBJECT_LEVEL_DIRS
     )
 
+    # plain writes instead of going through rich for each line
+    # stdout's own buffering batches them when the output is piped
     for subj, sess in todays_sessions_with_subject:
-        print(f"{subj} - {sess}")
+        sys.stdout.write(f"{subj} - {sess}\n")
 
 
 @app.command()
 def validate_today(
     processing_level: Annotated[
-        str,
-        typer.Argument(help="Processing level of the session. raw or processed."),
-    ] = "raw",
+        ProcessingLevel,
+        typer.Argument(help="Processing level of the session."),
+    ] = ProcessingLevel.raw,
     check_locally: Annotated[
         bool,
         typer.Option("--local/--remote", help="Check local or remote data."),
     ] = True,
-    check_behavior: Annotated[
-        bool,
-        typer.Option(
-            "--check-behavior/--ignore-behavior", help="Check behavioral data or not."
-        ),
-    ] = True,
-    check_ephys: Annotated[
-        bool,
-        typer.Option("--check-ephys/--ignore-ephys", help="Check ephys data or not."),
-    ] = True,
-    check_videos: Annotated[
-        bool,
-        typer.Option("--check-videos/--ignore-videos", help="Check videos data or not."),
-    ] = True,
+    check_behavior: Annotated[bool, _CHECK_BEHAVIOR_OPTION] = True,
+    check_ephys: Annotated[bool, _CHECK_EPHYS_OPTION] = True,
+    check_videos: Annotated[bool, _CHECK_VIDEOS_OPTION] = True,
 ):
     """
     Validate all sessions of all subjects that happened today.
     """
-    if processing_level != "raw":
-        raise NotImplementedError("Sorry, only raw data is supported for now.")
+    import datetime
+
+    from beneuro_data.config import _load_config
+    from beneuro_data.query_sessions import list_all_sessions_on_day
 
-    if all([not check_behavior, not check_ephys, not check_videos]):
+    if not (check_behavior or check_ephys or check_videos):
         raise ValueError("At least one data type must be checked.")
 
     config = _load_config()
     root_path = config.LOCAL_PATH if check_locally else config.REMOTE_PATH
-    raw_or_processed_path = root_path / processing_level
+    raw_or_processed_path = root_path / processing_level.value
 
     today = datetime.datetime.today()
 
-    for subject_path in raw_or_processed_path.iterdir():
-        if not subject_path.is_dir():
-            continue
+    # one walk over the subjects' folders, the same as list-today
+    # validate_raw_session takes plain strings, so no Path is built per session here
+    raw_or_processed_str = str(raw_or_processed_path)
+    sessions_with_subject = [
+        (os.path.join(raw_or_processed_str, subject_name, session_name), subject_name)
+        for subject_name, session_name in list_all_sessions_on_day(
+            raw_or_processed_path, today, config.IGNORED_SUBJECT_LEVEL_DIRS
+        )
+    ]
 
-        subject_name = subject_path.name
-        todays_sessions_with_subject = list_subject_sessions_on_day(subject_path, today)
-        for session_name in todays_sessions_with_subject:
-            session_path = subject_path / session_name
-            try:
-                validate_raw_session(
-                    session_path,
-                    subject_name,
-                    check_behavior,
-                    check_ephys,
-                    check_videos,
-                    config.WHITELISTED_FILES_IN_ROOT,
-                    config.EXTENSIONS_TO_RENAME_AND_UPLOAD,
-                )
-            except Exception as e:
-                print(f"[bold red]Problem with {session_path.name}: {e.args[0]}\n")
-            else:
-                print(f"[bold green]{session_path.name} looking good.\n")
+    _validate_sessions_concurrently(
+        sessions_with_subject,
+        check_behavior,
+        check_ephys,
+        check_videos,
+        config.WHITELISTED_FILES_IN_ROOT,
+        config.EXTENSIONS_TO_RENAME_AND_UPLOAD,
+    )
 
 
 @app.command()
@@ -1151,19 +1143,255 @@ def show_config():
     """
     Show the contents of the config file.
     """
-    config = _load_config()
+    from beneuro_data.config import _config_json, _get_package_path
+
+    config_json = _config_json()
     print(f"bnd source code is at {_get_package_path()}", end="\n\n")
-    print(config.json(indent=4))
+    print(config_json)
 
 
-def _check_root(root_path: Path):
-    assert root_path.exists(), f"{root_path} does not exist."
-    assert root_path.is_dir(), f"{root_path} is not a directory."
+def _subject_name_of_session(session_name: str) -> Optional[str]:
+    """
+    Returns the subject's name from a session name like M017_2024_03_12_18_45,
+    or None if the name is not in that format.
+    """
+    session_name_match = _SESSION_NAME_REGEX.fullmatch(session_name)
+    if session_name_match is None:
+        return None
+
+    return session_name_match["subject_name"]
+
+
+@lru_cache
+def _subject_path(root_path: Path, processing_level: str, subject_name: str) -> Path:
+    """
+    Path of a subject's folder at a given processing level under a local or remote root.
+    """
+    return root_path.joinpath(processing_level, subject_name)
+
+
+def _prompt_for_data_types(
+    include_behavior: Optional[bool],
+    include_ephys: Optional[bool],
+    include_videos: Optional[bool],
+) -> tuple[bool, bool, bool]:
+    """
+    Ask about the data types that were not specified as a CLI option in a single prompt.
+
+    The answer is the letters of the data types to include, e.g. "ev" or "e, v"
+    for ephys and videos.
+    Leaving it empty includes none of them.
+    """
+    include = {"b": include_behavior, "e": include_ephys, "v": include_videos}
+    data_type_names = {"b": "behavior", "e": "ephys", "v": "videos"}
+
+    unset_letters = [letter for letter, value in include.items() if value is None]
+
+    if len(unset_letters) > 0:
+
+        def parse_answer(answer: str) -> set[str]:
+            # letters can be separated by spaces or commas, e.g. "b v" or "b,e"
+            chosen_letters = set(re.sub(r"[\s,]", "", answer.lower()))
+            unknown_letters = chosen_letters - set(unset_letters)
+            if len(unknown_letters) > 0:
+                raise typer.BadParameter(
+                    f"Unexpected letters: {', '.join(sorted(unknown_letters))}"
+                )
+            return chosen_letters
+
+        options = ", ".join(
+            f"{letter}={data_type_names[letter]}" for letter in unset_letters
+        )
+        chosen_letters = typer.prompt(
+            f"Data to include [{options}] (leave empty for none)",
+            default="",
+            show_default=False,
+            value_proc=parse_answer,
+        )
+
+        for letter in unset_letters:
+            include[letter] = letter in chosen_letters
+
+    return include["b"], include["e"], include["v"]
+
+
+def _resolve_rename_flags(
+    include_videos: bool, rename_videos_first: Optional[bool]
+) -> bool:
+    """
+    Decide whether to rename the videos before uploading.
+
+    If not specified, videos are renamed if they are included.
+    Renaming videos that are not uploaded is not allowed.
+    """
+    if rename_videos_first is None:
+        return include_videos
+
+    if rename_videos_first and not include_videos:
+        raise ValueError(
+            "Do not rename videos if you're not uploading them. (Meaning --ignore-videos and --rename-videos are not allowed together.)"
+        )
+
+    return rename_videos_first
+
+
+def _validate_sessions_concurrently(
+    sessions_with_subject: list[tuple[Union[str, os.PathLike], str]],
+    check_behavior: bool,
+    check_ephys: bool,
+    check_videos: bool,
+    whitelisted_files_in_root: tuple[str, ...],
+    allowed_extensions_not_in_root: tuple[str, ...],
+    fail_fast: bool = False,
+    rename_videos_first: bool = False,
+    rename_extra_files_first: bool = False,
+) -> None:
+    """
+    Validate the given sessions in a thread pool and print whether each of them is valid.
+    Results are printed in the order of the session paths, regardless of which
+    session finishes validating first.
+
+    Parameters
+    ----------
+    sessions_with_subject : list[tuple[str or PathLike, str]]
+        Pairs of session path and the name of the subject the session belongs to.
+    check_behavior : bool
+        Whether to check the behavioral data.
+    check_ephys : bool
+        Whether to check the ephys data.
+    check_videos : bool
+        Whether to check the videos.
+    whitelisted_files_in_root : tuple[str, ...]
+        Filenames allowed in the session's root.
+    allowed_extensions_not_in_root : tuple[str, ...]
+        Extensions of extra files allowed outside the session's root.
+    fail_fast : bool, default False
+        Stop with exit code 1 at the first session that fails validation.
+    rename_videos_first : bool, default False
+        Rename the raw videos of each session before validating it.
+    rename_extra_files_first : bool, default False
+        Rename the extra files of each session before validating it.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from functools import partial
+
+    from beneuro_data.data_validation import validate_raw_session
+    from beneuro_data.extra_file_handling import rename_extra_files_in_session
+    from beneuro_data.video_renaming import rename_raw_videos_of_session
+
+    if len(sessions_with_subject) == 0:
+        return
+
+    # everything except the session and its subject is the same for all sessions
+    validate_files = partial(
+        validate_raw_session,
+        include_behavior=check_behavior,
+        include_ephys=check_ephys,
+        include_videos=check_videos,
+        whitelisted_files_in_root=whitelisted_files_in_root,
+        allowed_extensions_not_in_root=allowed_extensions_not_in_root,
+    )
+
+    def validate_session(session_path: Union[str, os.PathLike], subject_name: str):
+        # renaming only touches files inside the session, so it can run in the same thread
+        # and a session that can't be renamed is reported like any other problem
+        if rename_videos_first:
+            rename_raw_videos_of_session(Path(session_path), subject_name)
+
+        if rename_extra_files_first:
+            rename_extra_files_in_session(
+                Path(session_path),
+                whitelisted_files_in_root,
+                allowed_extensions_not_in_root,
+            )
+
+        validate_files(session_path, subject_name)
+
+    # validation is dominated by filesystem calls which release the GIL,
+    # so the sessions can be checked concurrently
+    with ThreadPoolExecutor(
+        max_workers=min(_MAX_VALIDATION_WORKERS, len(sessions_with_subject))
+    ) as executor:
+        # sorted, so that the report has the same order on every run
+        futures = [
+            (session_path, executor.submit(validate_session, session_path, subject_name))
+            for session_path, subject_name in sorted(
+                sessions_with_subject, key=lambda pair: os.fspath(pair[0])
+            )
+        ]
+
+        # results are printed from this thread only, so the output doesn't get interleaved
+        for session_path, future in futures:
+            session_name = os.path.basename(session_path)
+            try:
+                future.result()
+            except Exception as e:
+                _console.print(
+                    f"Problem with {session_name}: {e.args[0]}\n",
+                    style="bold red",
+                    markup=False,
+                )
+                if fail_fast:
+                    # don't start validating the sessions that are still queued
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise typer.Exit(code=1)
+            else:
+                _console.print(
+                    f"{session_name} looking good.\n", style="bold green", markup=False
+                )
+
+
+def _check_session_dir(session_path: Path):
+    """
+    Make sure that the session path exists and is a directory using a single stat call.
+    """
+    try:
+        session_path_stat = os.stat(session_path)
+    except (FileNotFoundError, NotADirectoryError):
+        # NotADirectoryError means that a parent of the path is a file
+        raise ValueError("Session path does not exist.") from None
+    except OSError as e:
+        raise ValueError(f"Cannot access session path {session_path}: {e.strerror}") from e
+
+    if not stat.S_ISDIR(session_path_stat.st_mode):
+        raise ValueError("Session path must be a directory.")
 
-    files_in_root = [f.stem for f in root_path.iterdir()]
 
-    assert "raw" in files_in_root, f"No raw folder in {root_path}"
-    assert "processed" in files_in_root, f"No processed folder in {root_path}"
+def _check_local_session_dir(session_path: Path, local_root: Path) -> Path:
+    """
+    Make sure that the session path is an existing directory inside the local root folder.
+
+    Returns the absolute session path.
+    """
+    from beneuro_data.data_validation import _folder_prefix
+
+    session_path = session_path.absolute()
+
+    _check_session_dir(session_path)
+    if not os.path.normcase(session_path).startswith(_folder_prefix(local_root)):
+        raise ValueError("Session path must be inside the local root folder.")
+
+    return session_path
+
+
+def _check_root(root_path: Path):
+    # opening the directory already fails if it doesn't exist or isn't a directory,
+    # so there is no need to stat it separately
+    # stop reading the listing as soon as both folders are seen
+    missing_folders = {"raw", "processed"}
+    try:
+        with os.scandir(root_path) as entries:
+            for entry in entries:
+                missing_folders.discard(entry.name)
+                if len(missing_folders) == 0:
+                    break
+    except FileNotFoundError:
+        raise AssertionError(f"{root_path} does not exist.")
+    except NotADirectoryError:
+        raise AssertionError(f"{root_path} is not a directory.")
+
+    assert "raw" not in missing_folders, f"No raw folder in {root_path}"
+    assert "processed" not in missing_folders, f"No processed folder in {root_path}"
 
 
 @app.command()
@@ -1171,6 +1399,8 @@ def check_config():
     """
     Check that the local and remote root folders have the expected raw and processed folders.
     """
+    from beneuro_data.config import _load_config
+
     config = _load_config()
 
     print(
@@ -1188,6 +1418,7 @@ def init():
     """
     Create a .env file to store the paths to the local and remote data storage.
     """
+    from beneuro_data.config import _get_env_path, _load_config
 
     # check if the file exists
     env_path = _get_env_path()
@@ -1215,9 +1446,11 @@ def init():
             f.write(f"REMOTE_PATH = {remote_path}\n")
 
         # make sure that it works
+        # the roots were checked above, so it's enough to see
+        # that the paths read back the same
         config = _load_config()
-        _check_root(config.LOCAL_PATH)
-        _check_root(config.REMOTE_PATH)
+        assert config.LOCAL_PATH == local_path, "Local path was not saved correctly."
+        assert config.REMOTE_PATH == remote_path, "Remote path was not saved correctly."
 
         print("[green]Config file created successfully.")
 
@@ -1227,6 +1460,8 @@ def check_updates():
     """
     Check if there are any new commits on the repo's main branch.
     """
+    from beneuro_data.update_bnd import check_for_updates
+
     check_for_updates()
 
 
@@ -1240,6 +1475,8 @@ def self_update(
     """
     Update the bnd tool by pulling the latest commits from the repo's main branch.
     """
+    from beneuro_data.update_bnd import update_bnd
+
     update_bnd(print_new_commits=verbose)
 
 
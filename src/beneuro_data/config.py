@@ -1,24 +1,33 @@
+import json
+import os
+from dataclasses import MISSING, asdict, dataclass, fields
+from functools import lru_cache
 from pathlib import Path
 
-from pydantic.v1 import BaseSettings
+from dotenv import dotenv_values
+
+# the package directory can't change while the process is running,
+# so both paths are computed once on import
+_PACKAGE_PATH = Path(__file__).absolute().parent.parent.parent
+_ENV_PATH = _PACKAGE_PATH / ".env"
 
 
 def _get_package_path() -> Path:
     """
     Returns the path to the package directory.
     """
-    return Path(__file__).absolute().parent.parent.parent
+    return _PACKAGE_PATH
 
 
 def _get_env_path() -> Path:
     """
     Returns the path to the .env file containing the configuration settings.
     """
-    package_path = _get_package_path()
-    return package_path / ".env"
+    return _ENV_PATH
 
 
-class Config(BaseSettings):
+@dataclass(frozen=True, slots=True)
+class Config:
     LOCAL_PATH: Path
     REMOTE_PATH: Path
     IGNORED_SUBJECT_LEVEL_DIRS: tuple[str, ...] = ("treadmill-calibration",)
@@ -30,15 +39,137 @@ class Config(BaseSettings):
     )
     EXTENSIONS_TO_RENAME_AND_UPLOAD: tuple[str, ...] = (".txt",)
 
-    class Config:
-        env_file = _get_env_path()
+
+_CONFIG_FIELD_NAMES = frozenset(field.name for field in fields(Config))
+
+
+def _parse_string_list(name: str, value: str) -> tuple[str, ...]:
+    """
+    Parses the JSON list of strings given for the setting `name` into a tuple.
+    Raises a ValueError naming the setting if the value is not a JSON list of strings.
+    """
+    error_message = f'{name} must be a JSON list of strings, e.g. ["a", "b"], got {value}'
+
+    try:
+        parsed_value = json.loads(value)
+    except json.JSONDecodeError as e:
+        raise ValueError(error_message) from e
+
+    if not isinstance(parsed_value, list) or not all(
+        isinstance(item, str) for item in parsed_value
+    ):
+        raise ValueError(error_message)
+
+    return tuple(parsed_value)
+
+
+def _read_config(env_path: Path) -> Config:
+    """
+    Reads the configuration settings from an .env file.
+
+    Environment variables take precedence over the file, and names are
+    case-insensitive in both. Tuple settings are given as JSON lists,
+    e.g. IGNORED_SUBJECT_LEVEL_DIRS=["treadmill-calibration"].
+
+    Parameters
+    ----------
+    env_path : Path
+        Path to the .env file.
+
+    Returns
+    -------
+    The parsed Config object.
+    Raises a ValueError if a setting without a default is not set,
+    or if a tuple setting is not a JSON list of strings.
+    """
+    values = {
+        name.upper(): value
+        for name, value in dotenv_values(env_path).items()
+        if value is not None
+    }
+    values.update((name.upper(), value) for name, value in os.environ.items())
+
+    settings = {}
+    for field in fields(Config):
+        if field.name not in values:
+            continue
+
+        if field.type is Path:
+            settings[field.name] = Path(values[field.name])
+        else:
+            settings[field.name] = _parse_string_list(field.name, values[field.name])
+
+    missing_names = [
+        field.name
+        for field in fields(Config)
+        if field.name not in settings and field.default is MISSING
+    ]
+    if len(missing_names) > 0:
+        raise ValueError(f"{', '.join(missing_names)} not set in {env_path}")
+
+    return Config(**settings)
+
+
+def _env_file_key() -> tuple[int, int]:
+    """
+    Returns the modification time and size of the .env file.
+    Used as the cache key of the loaded settings, so that a modified file is read again.
+    """
+    try:
+        env_stat = _get_env_path().stat()
+    except FileNotFoundError:
+        raise FileNotFoundError("Config file not found. Run `bnd init` to create one.")
+
+    return env_stat.st_mtime_ns, env_stat.st_size
+
+
+def _environment_key() -> tuple[tuple[str, str], ...]:
+    """
+    Returns the environment variables that set one of the config's settings.
+    Used as part of the cache key of the loaded settings, because they take precedence
+    over the .env file.
+    """
+    return tuple(
+        sorted(
+            (name.upper(), value)
+            for name, value in os.environ.items()
+            if name.upper() in _CONFIG_FIELD_NAMES
+        )
+    )
 
 
 def _load_config() -> Config:
     """
     Loads the configuration settings from the .env file and returns it as a Config object.
+    The result is cached until the .env file or the environment variables setting
+    the config are modified.
     """
-    if not _get_env_path().exists():
-        raise FileNotFoundError("Config file not found. Run `bnd init` to create one.")
+    return _load_config_cached(*_env_file_key(), _environment_key())
+
+
+@lru_cache(maxsize=1)
+def _load_config_cached(
+    env_mtime_ns: int, env_size: int, environment: tuple[tuple[str, str], ...]
+) -> Config:
+    """
+    Parses the .env file into a Config object.
+    The arguments are only used as the cache key, so that a modified file is read again.
+    """
+    return _read_config(_get_env_path())
+
+
+def _config_json() -> str:
+    """
+    Returns the configuration settings serialized to an indented JSON string.
+    The result is cached until the .env file or the environment variables setting
+    the config are modified.
+    """
+    return _config_json_cached(*_env_file_key(), _environment_key())
+
 
-    return Config()
+@lru_cache(maxsize=1)
+def _config_json_cached(
+    env_mtime_ns: int, env_size: int, environment: tuple[tuple[str, str], ...]
+) -> str:
+    config = _load_config_cached(env_mtime_ns, env_size, environment)
+    return json.dumps(asdict(config), default=str, indent=4)
@@ -1,5 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from functools import cached_property
 from pathlib import Path
+from typing import Optional
 
 import dateutil.tz
 import pandas as pd
@@ -9,7 +11,32 @@ from pydantic import FilePath
 from pynwb import NWBFile
 from pynwb.file import Subject
 
-from beneuro_data.data_validation import EXPECTED_DATE_FORMAT, validate_session_path
+from beneuro_data.data_validation import validate_session_path
+
+# looking up the timezone reads and parses the zoneinfo file, so only do it once
+_LONDON_TZ = dateutil.tz.gettz("Europe/London")
+
+
+def _parse_ymd(date_str: str) -> date:
+    """
+    Parse a date in the YYYY_MM_DD format.
+    Zero-padded dates are sliced, which is much cheaper than datetime.strptime.
+    Other dates strptime accepts, e.g. 2023_1_5, are still parsed with it.
+    """
+    year, month, day = date_str[:4], date_str[5:7], date_str[8:10]
+
+    if (
+        len(date_str) == 10
+        and date_str[4] == "_"
+        and date_str[7] == "_"
+        and all(part.isdecimal() for part in (year, month, day))
+    ):
+        return date(int(year), int(month), int(day))
+
+    try:
+        return datetime.strptime(date_str, "%Y_%m_%d").date()
+    except ValueError:
+        raise ValueError(f"{date_str} doesn't match expected format of YYYY_MM_DD")
 
 
 class AnimalProfileInterface(BaseDataInterface):
@@ -30,59 +57,111 @@ class AnimalProfileInterface(BaseDataInterface):
                 f"{self.profile_file_path.name} doesn't exists at {self.profile_file_path}"
             )
 
-        # if it exists, read the contents
-        self.profile_lines = self.profile_file_path.read_text().splitlines()
+    # the profile is only read and parsed when one of these is first needed,
+    # and the results are reused by get_metadata and add_to_nwbfile
 
-        # extract the session's date
-        self.session_date = datetime.strptime(
-            self.session_name.replace(f"{self.subject_name}_", ""),
-            EXPECTED_DATE_FORMAT,
-        ).date()
+    @cached_property
+    def profile_lines(self) -> list[str]:
+        return self.profile_file_path.read_text().splitlines()
 
-        # if it's in there, load session info from the profile file into a pd.Series
+    @cached_property
+    def header_fields(self) -> list[tuple[str, str]]:
+        """
+        (field, value) pairs of the "#field:value" lines in the profile file's header
+        """
+        return [
+            (line[1:].split(":", 1)[0], line.split(":")[-1])
+            for line in self.profile_lines
+            if line.startswith("#")
+        ]
+
+    @cached_property
+    def session_date(self) -> date:
+        # the session name's format was already checked by validate_session_path
+        # and its date part starts with YYYY_MM_DD
+        date_str = self.session_name.replace(f"{self.subject_name}_", "")
+        return _parse_ymd(date_str[:10])
+
+    @cached_property
+    def session_info(self) -> Optional[pd.Series]:
+        """
+        Session info from the profile file, or None if the session is not in there
+        """
         try:
-            self.session_info = self.load_session_info()
+            return self.load_session_info()
         except ValueError:
-            self.session_info = None
+            return None
+
+    @cached_property
+    def date_of_birth(self) -> datetime:
+        dob = _parse_ymd(self.extract_data_from_header("DoB"))
+        return datetime.combine(dob, datetime.min.time())
+
+    @cached_property
+    def age(self) -> timedelta:
+        return self.session_date - self.date_of_birth.date()
 
     def load_session_info(self) -> pd.Series:
         """
         Loads the line from the .profile file corresponding to the session as a pd.Series
+        Values are kept as strings, and missing trailing values are NaN.
         """
-        sessions_table = pd.read_csv(
-            self.profile_file_path,
-            sep=r"\s+",
-            comment="#",
+        # the file is small, so instead of pd.read_csv just split the lines on whitespace,
+        # ignoring everything after a # like pandas' comment option would
+        rows = [line.split("#", 1)[0].split() for line in self.profile_lines]
+        rows = [row for row in rows if len(row) > 0]
+        if len(rows) == 0:
+            raise ValueError(f"No sessions table found in {self.profile_file_path}")
+
+        header, *session_rows = rows
+        sessions_column = header.index("Sessions")
+
+        # pd.read_csv would fail on these too, instead of silently dropping values
+        for row in session_rows:
+            if len(row) > len(header):
+                raise ValueError(
+                    f"Row starting with {row[0]} has more values than the header "
+                    f"in {self.profile_file_path}"
+                )
+
+        # session names can be marked with a leading %, which is not part of the name
+        matching_rows = (
+            row
+            for row in session_rows
+            if len(row) > sessions_column
+            and row[sessions_column].lstrip("%") == self.session_name
         )
-        sessions_table.replace(to_replace={"Sessions": {"%": ""}}, regex=True, inplace=True)
 
-        if self.session_name not in sessions_table.Sessions.values:
+        # stop scanning as soon as a second matching row is found
+        session_row = next(matching_rows, None)
+        if session_row is None:
             raise ValueError(f"{self.session_name} not found in {self.profile_file_path}")
 
-        if sum(sessions_table.Sessions == self.session_name) > 1:
+        if next(matching_rows, None) is not None:
             raise ValueError(
                 f"Multiple rows for {self.session_name} found in profile file."
             )
 
-        return sessions_table[sessions_table.Sessions == self.session_name].iloc[0]
+        session_info = dict(zip(header, session_row))
+        session_info["Sessions"] = self.session_name
+
+        # missing trailing values become NaN, as they would with pd.read_csv
+        return pd.Series(session_info, index=header, dtype=object)
 
     def extract_data_from_header(self, field: str) -> str:
         """
         Get the value (as a string) corresponding to `field` from the profile file's header
         """
-        field_lines = [line for line in self.profile_lines if line.startswith(f"#{field}")]
-        assert len(field_lines) == 1
-        return field_lines[0].split(":")[-1]
+        # fields are matched on their start, so e.g. "#DoB (YYYY_MM_DD):..." is found as DoB
+        field_values = [value for key, value in self.header_fields if key.startswith(field)]
+        assert len(field_values) == 1
+        return field_values[0]
 
     def add_subject(self, nwbfile: NWBFile) -> None:
         assert nwbfile.subject is None
 
         SPECIES = "Mus musculus"
 
-        date_of_birth = datetime.strptime(self.extract_data_from_header("DoB"), "%Y_%m_%d")
-
-        age = self.session_date - date_of_birth.date()
-
         try:
             weight = float(self.session_info.weight)
         except (ValueError, AttributeError):
@@ -90,9 +169,9 @@ class AnimalProfileInterface(BaseDataInterface):
 
         nwbfile.subject = Subject(
             subject_id=self.subject_name,
-            age=f"P{age.days}",
+            age=f"P{self.age.days}",
             age__reference="birth",
-            date_of_birth=date_of_birth.astimezone(dateutil.tz.gettz("Europe/London")),
+            date_of_birth=self.date_of_birth.astimezone(_LONDON_TZ),
             sex=self.extract_data_from_header("sex"),
             strain=self.extract_data_from_header("strain"),
             species=SPECIES,
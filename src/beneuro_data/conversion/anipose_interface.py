@@ -1,4 +1,5 @@
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -51,6 +52,14 @@ class AniposeInterface(BaseTemporalAlignmentInterface):
         ("right_ankle_angle", ["right_knee", "right_ankle", "right_foot"]),
     )
 
+    # the only columns of the CSV that end up in the NWB file
+    keypoint_columns = tuple(
+        f"{keypoint_name}_{axis}"
+        for keypoint_name in keypoint_names
+        for axis in ("x", "y", "z")
+    )
+    angle_columns = tuple(angle_name for angle_name, _ in angle_names_and_references)
+
     def __init__(self, csv_path: FilePath, raw_session_path: Optional[FilePath] = None):
         super().__init__()
 
@@ -100,31 +109,41 @@ class AniposeInterface(BaseTemporalAlignmentInterface):
             starting_time = None
             rate = None
 
+        # convert the DataFrame to a single float32 matrix once,
+        # and take every series' data from that instead of from the DataFrame
+        pose_matrix = self.pose_data.to_numpy()
+        column_indices = {column: i for i, column in enumerate(self.pose_data.columns)}
+
+        # each keypoint's data is a (n_frames, 3) view of this
+        keypoint_data = pose_matrix[
+            :, [column_indices[column] for column in self.keypoint_columns]
+        ].reshape(self.n_frames, len(self.keypoint_names), 3)
+
+        # we don't have confidence estimates, so every series shares the same nan array
+        nan_confidence = np.full(self.n_frames, np.nan)
+
         keypoint_series_objects = []
-        for keypoint_name in self.keypoint_names:
+        for i, keypoint_name in enumerate(self.keypoint_names):
             keypoint_series = PoseEstimationSeries(
                 name=keypoint_name,
                 description=f"Marker placed at {keypoint_name.replace('_', ' ')}",
-                data=self.pose_data[
-                    [f"{keypoint_name}_x", f"{keypoint_name}_y", f"{keypoint_name}_z"]
-                ].to_numpy(),
+                data=keypoint_data[:, i, :],
                 unit="mm",
                 reference_frame="(0, 0, 0) is hip_center's median across all frames",
                 timestamps=timestamps,
                 starting_time=starting_time,
                 rate=rate,
-                confidence=np.full(self.n_frames, np.nan),
+                confidence=nan_confidence,
                 confidence_definition="Filled with nan because we don't have an estimate.",
             )
             keypoint_series_objects.append(keypoint_series)
 
         for angle_name, angle_reference in self.angle_names_and_references:
-            angle_array = self.pose_data[[f"{angle_name}"]].to_numpy()
+            angle_data = np.zeros((self.n_frames, 2), dtype=np.float32)
+            angle_data[:, 0] = pose_matrix[:, column_indices[angle_name]]
             angle_series = PoseEstimationSeries(
                 name=angle_name,
-                data=np.concatenate(
-                    (angle_array, np.zeros((angle_array.shape[0], 1))), axis=1
-                ),
+                data=angle_data,
                 description="Angle information. Second dimension is zeros since since minimum"
                 " 2D array is needed for PoseEstimationSeries",
                 unit="degrees",
@@ -132,7 +151,7 @@ class AniposeInterface(BaseTemporalAlignmentInterface):
                 timestamps=timestamps,
                 starting_time=starting_time,
                 rate=rate,
-                confidence=np.full(self.n_frames, np.nan),
+                confidence=nan_confidence,
                 confidence_definition="Filled with nan because we don't have an estimate.",
             )
             keypoint_series_objects.append(angle_series)
@@ -156,8 +175,14 @@ class AniposeInterface(BaseTemporalAlignmentInterface):
             stacklevel=2,
         )
         with h5py.File(self.h5_path, "r") as file:
-            assert file["tracks"].shape[1] == 1
-            pose_data = file["tracks"][:, 0, :, :]
+            tracks = file["tracks"]
+            assert tracks.shape[1] == 1
+
+            # read the single track straight into its final array
+            pose_data = np.empty(
+                (tracks.shape[0], tracks.shape[2], tracks.shape[3]), dtype=tracks.dtype
+            )
+            tracks.read_direct(pose_data, source_sel=np.s_[:, 0, :, :])
 
         return pose_data
 
@@ -165,8 +190,14 @@ class AniposeInterface(BaseTemporalAlignmentInterface):
         """
         Load pose estimation results from a CSV file where each keypoint and angle
         has its own column.
+        Only the keypoint and angle columns are read, as float32.
         """
-        pose_data = pd.read_csv(self.csv_path)
+        columns = self.keypoint_columns + self.angle_columns
+        pose_data = pd.read_csv(
+            self.csv_path,
+            usecols=list(columns),
+            dtype={column: np.float32 for column in columns},
+        )
         return pose_data
 
     @property
@@ -195,17 +226,12 @@ class AniposeInterface(BaseTemporalAlignmentInterface):
 
         print("Setting pose estimation timestamps using pulse signal from SpikeGLX...")
 
-        rising_edges_dict = {}
-        for stream_name in stream_names:
-            rec_with_sync_channel = se.read_spikeglx(
-                self.raw_session_path, stream_name=stream_name, load_sync_channel=True
+        # the streams are read from separate files, so load them in parallel
+        with ThreadPoolExecutor(max_workers=len(stream_names)) as executor:
+            rising_edges_dict = dict(
+                zip(stream_names, executor.map(self._load_rising_edges, stream_names))
             )
 
-            last_channel = np.array(rec_with_sync_channel.get_traces()[1:, -1])
-            rising_frames = get_rising_frames_from_ttl(last_channel)
-            rising_edges_sec = rising_frames / rec_with_sync_channel.sampling_frequency
-            rising_edges_dict[stream_name] = rising_edges_sec
-
         for rising_edges_sec in rising_edges_dict.values():
             assert rising_edges_sec.size == self.n_frames
 
@@ -215,3 +241,20 @@ class AniposeInterface(BaseTemporalAlignmentInterface):
         mid_timestamps_sec -= mid_timestamps_sec[0]
 
         return mid_timestamps_sec
+
+    def _load_rising_edges(self, stream_name: str) -> np.ndarray:
+        """
+        Load the times (in seconds) of rising edges in a SpikeGLX stream's sync channel
+        """
+        rec_with_sync_channel = se.read_spikeglx(
+            self.raw_session_path, stream_name=stream_name, load_sync_channel=True
+        )
+
+        # only read the sync channel instead of every channel of the recording
+        last_channel = rec_with_sync_channel.get_traces(
+            start_frame=1,
+            channel_ids=[rec_with_sync_channel.channel_ids[-1]],
+        )[:, 0]
+        rising_frames = get_rising_frames_from_ttl(last_channel)
+
+        return rising_frames / rec_with_sync_channel.sampling_frequency
@@ -1,14 +1,23 @@
+import os
 import re
 import warnings
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 
 from beneuro_data.extra_file_handling import _find_whitelisted_files_in_root
 
 # this is the expected format the end of the session folder should have
 # e.g. M016_2023_08_15_16_00
 EXPECTED_DATE_FORMAT: str = "%Y_%m_%d_%H_%M"
+# zero-padded digits in the shape of EXPECTED_DATE_FORMAT
+EXPECTED_DATE_REGEX: re.Pattern = re.compile(
+    r"[0-9]{4}_[0-9]{2}_[0-9]{2}_[0-9]{2}_[0-9]{2}"
+)
+
+# TODO can there be multiple numbers after the _g?
+# SPIKEGLX_RECORDING_PATTERN = r"_g(\d+)$"
+SPIKEGLX_RECORDING_REGEX: re.Pattern = re.compile(r"_g(\d)$")
 
 
 class WrongNumberOfFilesError(Exception):
@@ -16,7 +25,7 @@ class WrongNumberOfFilesError(Exception):
 
 
 def validate_raw_session(
-    session_path: Path,
+    session_path: Union[str, os.PathLike],
     subject_name: str,
     include_behavior: bool,
     include_ephys: bool,
@@ -29,7 +38,7 @@ def validate_raw_session(
 
     Parameters
     ----------
-    session_path : Path
+    session_path : str or PathLike
         Path to the session.
     subject_name : str
         Name of the subject. (Needed for validation.)
@@ -51,42 +60,179 @@ def validate_raw_session(
     A tuple of the files and folders that are found and validated:
     (behavior_files, ephys_files, video_files)
     """
+    # accept plain strings, e.g. DirEntry.path, and only convert them here
+    session_path = Path(session_path)
+
     # have to rename first so that validation passes
     behavior_files = []
     ephys_files = []
     video_files = []
 
+    # the behavioral validator checks the session's path as well
     if include_behavior:
         behavior_files = validate_raw_behavioral_data_of_session(
             session_path, subject_name, whitelisted_files_in_root
         )
+    elif include_ephys or include_videos:
+        validate_session_path(session_path, subject_name)
+
+    # walk the session's folder once and let the validators filter this listing
+    # instead of each of them searching the folder recursively on their own
+    session_files = None
+    if include_ephys or include_videos:
+        session_files = _list_files_in_session(session_path)
+
     if include_ephys:
         ephys_files = validate_raw_ephys_data_of_session(
-            session_path, subject_name, allowed_extensions_not_in_root
+            session_path,
+            subject_name,
+            allowed_extensions_not_in_root,
+            session_files=session_files,
         )
     if include_videos:
-        video_files = validate_raw_videos_of_session(session_path, subject_name)
+        video_files = validate_raw_videos_of_session(
+            session_path, subject_name, session_files=session_files
+        )
 
     return behavior_files, ephys_files, video_files
 
 
+def _list_files_in_session(session_path: Path) -> list[Path]:
+    """
+    List all files in a session's folder and its subfolders with a single walk of
+    `os.scandir` calls, which gets the entry types from the directory listings
+    instead of a separate stat call per entry.
+
+    Parameters
+    ----------
+    session_path : Path
+        Path to the session.
+
+    Returns
+    -------
+    List of paths to the files found.
+    """
+    return [Path(entry.path) for entry in _iter_file_entries_in_session(session_path)]
+
+
+def _iter_file_entries_in_session(session_path: Path) -> Iterator[os.DirEntry]:
+    """
+    Yield the `os.DirEntry` of every file in a session's folder and its subfolders.
+
+    Directories are only listed when the caller asks for more entries,
+    so stopping the iteration early skips the rest of the walk.
+    """
+    dirs_to_scan = [session_path]
+    while dirs_to_scan:
+        with os.scandir(dirs_to_scan.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs_to_scan.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
+def _folder_prefix(folder_path: Path) -> str:
+    """
+    Returns the folder's path as a string ending with a separator, with its case
+    normalized by `os.path.normcase`.
+
+    For paths inside the folder `os.path.normcase(path).startswith(prefix)` gives the
+    same result as `path.is_relative_to(folder_path)`, but is a lot cheaper when
+    checking many paths.
+    """
+    return os.path.join(os.path.normcase(folder_path), "")
+
+
+def _get_ap_stream_names_of_probes(session_path: Path, probes: list[str]) -> list[str]:
+    """
+    Get the names of the AP streams of the given probes, making sure that there is a
+    .bin file for each of them somewhere in the session.
+
+    Parameters
+    ----------
+    session_path : Path
+        Path to the session.
+    probes : list[str]
+        Names of the probes, e.g. ["imec0", "imec1"]
+
+    Returns
+    -------
+    List of the stream names, e.g. ["imec0.ap", "imec1.ap"]
+    Raises a ValueError if there are duplicates or files are not found for some probes.
+    """
+    if len(set(probes)) != len(probes):
+        raise ValueError(f"Duplicate probe names found in {probes}.")
+
+    # append .ap to each probe name
+    stream_names = [f"{probe}.ap" for probe in probes]
+
+    # first look where SpikeGLX puts the files:
+    # <session>/<session>_gx/<session>_gx_imecy/<session>_gx_t0.imecy.ap.bin
+    with os.scandir(session_path) as entries:
+        recording_folder_paths = [
+            Path(entry.path)
+            for entry in entries
+            if SPIKEGLX_RECORDING_REGEX.search(entry.name) is not None and entry.is_dir()
+        ]
+    missing_stream_names = [
+        f"{probe}.ap"
+        for probe in probes
+        if not any(
+            (
+                recording_path
+                / f"{recording_path.name}_{probe}"
+                / f"{recording_path.name}_t0.{probe}.ap.bin"
+            ).exists()
+            for recording_path in recording_folder_paths
+        )
+    ]
+
+    # only search the whole session for the ones that are not in the expected place
+    # and stop walking it as soon as all of them are found
+    if len(missing_stream_names) > 0:
+        not_found = set(missing_stream_names)
+        for entry in _iter_file_entries_in_session(session_path):
+            filename = os.path.normcase(entry.name)
+            if filename.endswith(".bin"):
+                not_found.difference_update(
+                    [
+                        stream_name
+                        for stream_name in not_found
+                        if filename.endswith(os.path.normcase(f"{stream_name}.bin"))
+                    ]
+                )
+                if len(not_found) == 0:
+                    break
+
+        missing_stream_names = [
+            stream_name for stream_name in missing_stream_names if stream_name in not_found
+        ]
+
+    if len(missing_stream_names) > 0:
+        raise ValueError(
+            f"No file found for {', '.join(missing_stream_names)} in {session_path}"
+        )
+
+    return stream_names
+
+
 def validate_date_format(extracted_date_str: str) -> bool:
     """
     Validate that the date extracted from a session name is in the expected format.
 
     Returns True if the date string is in the expected format, raises ValueError otherwise.
     """
-    # parsing the string to datetime, then generating the correctly formatted string to compare to
     try:
-        correct_str = datetime.strptime(extracted_date_str, EXPECTED_DATE_FORMAT).strftime(
-            EXPECTED_DATE_FORMAT
-        )
+        parsed_date = datetime.strptime(extracted_date_str, EXPECTED_DATE_FORMAT)
     except ValueError:
         raise ValueError(
             f"{extracted_date_str} doesn't match expected format of {EXPECTED_DATE_FORMAT}"
         )
 
-    if extracted_date_str != correct_str:
+    # strptime also accepts fields that are not zero-padded, e.g. 2023_8_15_16_0
+    if EXPECTED_DATE_REGEX.fullmatch(extracted_date_str) is None:
+        correct_str = parsed_date.strftime(EXPECTED_DATE_FORMAT)
         raise ValueError(
             f"{extracted_date_str} doesn't match expected format of {correct_str}"
         )
@@ -283,6 +429,7 @@ def validate_raw_ephys_data_of_session(
     session_path: Path,
     subject_name: str,
     allowed_extensions_not_in_root: tuple[str, ...],
+    session_files: Optional[list[Path]] = None,
 ) -> list[Path]:
     """
     Validate electrophysiology data of a raw session.
@@ -297,13 +444,18 @@ def validate_raw_ephys_data_of_session(
         A tuple of file extensions that are allowed in the session directory excluding the root level.
         E.g. (".txt", )
         For what's allowed in the root, use `whitelisted_files_in_root`.
+    session_files : Optional[list[Path]], default: None
+        All files in the session as returned by `_list_files_in_session`.
+        If not given, the session's path is validated and its files are listed here.
 
     Returns
     -------
     List of files in the recording folders.
     """
-    # validate that the session's path and folder name are in the expected format
-    validate_session_path(session_path, subject_name)
+    if session_files is None:
+        # validate that the session's path and folder name are in the expected format
+        validate_session_path(session_path, subject_name)
+        session_files = _list_files_in_session(session_path)
 
     recording_folder_paths = _find_spikeglx_recording_folders_in_session(session_path)
 
@@ -312,22 +464,21 @@ def validate_raw_ephys_data_of_session(
         validate_raw_ephys_recording(recording_path, allowed_extensions_not_in_root)
 
     # search subfolders for spikeglx filetypes and make sure that all of them are in the recording folders found
-    spikeglx_endings = [".lf.meta", ".lf.bin", ".ap.meta", ".ap.bin"]
-    for ending in spikeglx_endings:
-        for spikeglx_filepath in session_path.glob(f"**/*{ending}"):
-            if not any(
-                spikeglx_filepath.is_relative_to(recording_path)
-                for recording_path in recording_folder_paths
-            ):
-                raise ValueError(
-                    f"{spikeglx_filepath} is not in any known recording folders."
-                )
+    # names are compared after normcase, so that they are case-insensitive on Windows
+    # like glob was
+    spikeglx_endings = (".lf.meta", ".lf.bin", ".ap.meta", ".ap.bin")
+    recording_folder_prefixes = tuple(_folder_prefix(p) for p in recording_folder_paths)
+    for spikeglx_filepath in session_files:
+        if not os.path.normcase(spikeglx_filepath.name).endswith(spikeglx_endings):
+            continue
+        if not os.path.normcase(spikeglx_filepath).startswith(recording_folder_prefixes):
+            raise ValueError(f"{spikeglx_filepath} is not in any known recording folders.")
 
     ephys_files = [
         p
-        for recording_folder in recording_folder_paths
-        for p in recording_folder.glob("**/*")
-        if p.is_file()
+        for recording_folder_prefix in recording_folder_prefixes
+        for p in session_files
+        if os.path.normcase(p).startswith(recording_folder_prefix)
     ]
 
     return ephys_files
@@ -369,20 +520,21 @@ def validate_raw_ephys_recording(
     # validate that there are only subfolders in the recording's folder
     # hidden files are allowed
     probe_subfolders = []
-    for child in gid_folder_path.iterdir():
-        # hidden files are allowed
-        if child.match(".*"):
-            continue
+    with os.scandir(gid_folder_path) as entries:
+        for entry in entries:
+            # hidden files are allowed
+            if entry.name.startswith("."):
+                continue
 
-        # files with some extensions are allowed and will be renamed and uploaded
-        if child.suffix in allowed_extensions_not_in_root:
-            continue
+            # files with some extensions are allowed and will be renamed and uploaded
+            if os.path.splitext(entry.name)[1] in allowed_extensions_not_in_root:
+                continue
 
-        if not child.is_dir():
-            raise ValueError("Only folders are allowed in the ephys recordings folder")
+            if not entry.is_dir():
+                raise ValueError("Only folders are allowed in the ephys recordings folder")
 
-        # the directories should be the probes' subfolders
-        probe_subfolders.append(child)
+            # the directories should be the probes' subfolders
+            probe_subfolders.append(Path(entry.path))
 
     # validate that the probe subfolders have the expected name
     probe_subfolder_pattern = rf"{gid_folder_path.name}_imec\d$"
@@ -414,11 +566,7 @@ def extract_gid(folder_name: str) -> str:
 
     Example: M016_2023_08_15_16_00_g1 -> g1
     """
-    # TODO can there be multiple numbers after the _g?
-    # SPIKEGLX_RECORDING_PATTERN = r"_g(\d+)$"
-    SPIKEGLX_RECORDING_PATTERN = r"_g(\d)$"
-
-    gid_search_result = re.search(SPIKEGLX_RECORDING_PATTERN, folder_name)
+    gid_search_result = SPIKEGLX_RECORDING_REGEX.search(folder_name)
 
     if gid_search_result is None:
         raise ValueError(f"Could not extract correct recording ID from {folder_name}")
@@ -430,6 +578,7 @@ def validate_raw_videos_of_session(
     session_path: Path,
     subject_name: str,
     warn_if_no_video_folder: bool = True,
+    session_files: Optional[list[Path]] = None,
 ) -> list[Path]:
     """
     Validate that the videos are in a folder that has the expected name, and that the files
@@ -445,13 +594,18 @@ def validate_raw_videos_of_session(
         Name of the subject. (Needed for validation.)
     warn_if_no_video_folder : bool, default: True
         Whether to warn if the video folder is not found.
+    session_files : Optional[list[Path]], default: None
+        All files in the session as returned by `_list_files_in_session`.
+        If not given, the session's path is validated and its files are listed here.
 
     Returns
     -------
     List of files in the video folder if it exists, None otherwise.
     """
-    # validate that the session's path and folder name are in the expected format
-    validate_session_path(session_path, subject_name)
+    if session_files is None:
+        # validate that the session's path and folder name are in the expected format
+        validate_session_path(session_path, subject_name)
+        session_files = _list_files_in_session(session_path)
 
     video_extension = ".avi"
 
@@ -495,21 +649,29 @@ def validate_raw_videos_of_session(
         if len(remaining_files_in_folder) > 1:
             raise ValueError(f"Found unexpected files in video folder {video_folder_path}")
 
+    video_folder_prefix = _folder_prefix(video_folder_path)
+
     # make sure there are no avi files in another directory
-    for avi_path in session_path.glob(rf"**/*{video_extension}"):
-        if not avi_path.is_relative_to(video_folder_path):
+    for avi_path in session_files:
+        if os.path.normcase(avi_path.suffix) != video_extension:
+            continue
+        if not os.path.normcase(avi_path).startswith(video_folder_prefix):
             raise ValueError(
                 f"Found {video_extension} file in unexpected location: {avi_path}. Expected it to be in {video_folder_path}"
             )
 
     # make sure there are no metadata.csv files in another directory
-    for metadata_path in session_path.glob("**/metadata.csv"):
-        if not metadata_path.is_relative_to(video_folder_path):
+    for metadata_path in session_files:
+        if os.path.normcase(metadata_path.name) != "metadata.csv":
+            continue
+        if not os.path.normcase(metadata_path).startswith(video_folder_prefix):
             raise ValueError(
                 f"Found metadata.csv file in unexpected location: {metadata_path}. Expected it to be in {video_folder_path}"
             )
 
     if video_folder_exists:
-        return [p for p in video_folder_path.glob("**/*") if p.is_file()]
+        return [
+            p for p in session_files if os.path.normcase(p).startswith(video_folder_prefix)
+        ]
 
     return []
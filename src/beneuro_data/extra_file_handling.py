@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -22,14 +23,22 @@ def _find_whitelisted_files_in_root(
     """
     session_name = session_path.name
 
+    # list the root once instead of checking every candidate with a separate exists() call
+    # normcase keeps the matching case-insensitive on Windows like exists() was
+    try:
+        with os.scandir(session_path) as entries:
+            names_in_root = {os.path.normcase(entry.name) for entry in entries}
+    except FileNotFoundError:
+        return []
+
     files_found = []
     for filename in whitelisted_files_in_root:
         # try the filename as is
-        if (session_path / filename).exists():
+        if os.path.normcase(filename) in names_in_root:
             files_found.append(session_path / filename)
 
         # try the filename with the session name in front of it
-        if (session_path / (session_name + "_" + filename)).exists():
+        if os.path.normcase(session_name + "_" + filename) in names_in_root:
             files_found.append(session_path / (session_name + "_" + filename))
 
     return files_found
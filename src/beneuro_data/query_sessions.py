@@ -1,7 +1,8 @@
 import datetime
+import os
 from pathlib import Path
+from typing import Iterator
 
-from .config import _load_config
 from .data_validation import EXPECTED_DATE_FORMAT, validate_session_path
 
 
@@ -27,14 +28,16 @@ def list_subject_sessions(
     """
     valid_subject_sessions = []
     invalid_subject_sessions = []
-    for session_path in subject_path.iterdir():
-        if session_path.is_dir():
-            try:
-                validate_session_path(session_path, subject_name)
-            except ValueError:
-                invalid_subject_sessions.append(session_path)
-            else:
-                valid_subject_sessions.append(session_path)
+    with os.scandir(subject_path) as entries:
+        session_paths = [Path(entry.path) for entry in entries if entry.is_dir()]
+
+    for session_path in session_paths:
+        try:
+            validate_session_path(session_path, subject_name)
+        except ValueError:
+            invalid_subject_sessions.append(session_path)
+        else:
+            valid_subject_sessions.append(session_path)
 
     return valid_subject_sessions, invalid_subject_sessions
 
@@ -74,13 +77,29 @@ def list_subject_sessions_on_day(subject_path: Path, day: datetime.date) -> list
     date_only_format = "%Y_%m_%d"
     day_str = day.strftime(date_only_format)
 
-    days_sessions = []
-    for session_path in subject_path.iterdir():
-        if session_path.is_dir():
-            if day_str in session_path.name:
-                days_sessions.append(session_path.name)
+    with os.scandir(subject_path) as entries:
+        return [entry.name for entry in entries if day_str in entry.name and entry.is_dir()]
 
-    return days_sessions
+
+def iter_all_sessions_on_day(
+    raw_or_processed_path: Path,
+    day: datetime.date,
+    ignored_subject_level_dirs: tuple[str, ...],
+) -> Iterator[tuple[str, str]]:
+    """
+    Same as list_all_sessions_on_day, but yields the (subject_name, session_name)
+    tuples one subject at a time instead of collecting them into a list first.
+    """
+    with os.scandir(raw_or_processed_path) as entries:
+        subject_paths = [
+            Path(entry.path)
+            for entry in entries
+            if entry.name not in ignored_subject_level_dirs and entry.is_dir()
+        ]
+
+    for subject_path in subject_paths:
+        for sess_name in list_subject_sessions_on_day(subject_path, day):
+            yield subject_path.name, sess_name
 
 
 def list_all_sessions_on_day(
@@ -92,14 +111,6 @@ def list_all_sessions_on_day(
     Lists all sessions on a given day from all subjects.
     Returns a list of tuples with (subject_name, session_name).
     """
-    days_sessions = []
-    for subject_path in raw_or_processed_path.iterdir():
-        if subject_path.is_dir():
-            subject_name = subject_path.name
-            if subject_name in ignored_subject_level_dirs:
-                continue
-
-            for sess_name in list_subject_sessions_on_day(subject_path, day):
-                days_sessions.append((subject_name, sess_name))
-
-    return days_sessions
+    return list(
+        iter_all_sessions_on_day(raw_or_processed_path, day, ignored_subject_level_dirs)
+    )
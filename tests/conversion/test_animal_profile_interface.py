@@ -0,0 +1,104 @@
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from beneuro_data.conversion.animal_profile_interface import (
+    AnimalProfileInterface,
+    _parse_ymd,
+)
+
+SESSION_NAME = "M011_2023_04_04_16_00"
+
+
+def _make_interface(tmp_path: Path, profile_text: str) -> AnimalProfileInterface:
+    subject_path = tmp_path / "M011"
+    session_path = subject_path / SESSION_NAME
+    session_path.mkdir(parents=True)
+    (subject_path / "M011.profile").write_text(profile_text)
+
+    return AnimalProfileInterface(session_path)
+
+
+@pytest.mark.processing
+def test_parse_ymd():
+    assert _parse_ymd("2023_01_05") == date(2023, 1, 5)
+    # dates that are not zero-padded are accepted like strptime did
+    assert _parse_ymd("2023_1_5") == date(2023, 1, 5)
+
+
+@pytest.mark.processing
+@pytest.mark.parametrize(
+    "date_str", ["2023-01-01", "2023010112", "2023_01_05_16_00", "2023_0a_05"]
+)
+def test_parse_ymd_wrong_format(date_str: str):
+    with pytest.raises(ValueError, match="doesn't match expected format of YYYY_MM_DD"):
+        _parse_ymd(date_str)
+
+
+@pytest.mark.processing
+def test_extract_data_from_header_matches_field_prefix(tmp_path):
+    interface = _make_interface(
+        tmp_path,
+        "#DoB (YYYY_MM_DD):2023_01_05\n"
+        "#sex M/F:F\n"
+        "#strain:C57BL/6\n"
+        "#strain_details:from the lab\n",
+    )
+
+    assert interface.extract_data_from_header("DoB") == "2023_01_05"
+    assert interface.extract_data_from_header("sex") == "F"
+    assert interface.date_of_birth.date() == date(2023, 1, 5)
+
+    # a field has to be the start of exactly one header line
+    with pytest.raises(AssertionError):
+        interface.extract_data_from_header("strain")
+
+
+PROFILE_WITH_SESSIONS = """#DoB:2023_01_05
+#sex:F
+
+Sessions weight experimenter # comments are ignored
+%M011_2023_04_04_16_00 21.5 bence
+M011_2023_04_05_16_00 22
+M011_2023_04_06_16_00 22 bence
+M011_2023_04_06_16_00 23 bence
+"""
+
+
+@pytest.mark.processing
+def test_load_session_info(tmp_path):
+    interface = _make_interface(tmp_path, PROFILE_WITH_SESSIONS)
+
+    # the leading % is not part of the session name
+    session_info = interface.load_session_info()
+    assert session_info.Sessions == SESSION_NAME
+    assert session_info.weight == "21.5"
+    assert session_info.experimenter == "bence"
+
+    # missing trailing values are NaN
+    interface.session_name = "M011_2023_04_05_16_00"
+    session_info = interface.load_session_info()
+    assert session_info.weight == "22"
+    assert pd.isna(session_info.experimenter)
+
+    interface.session_name = "M011_2023_04_06_16_00"
+    with pytest.raises(ValueError, match="Multiple rows"):
+        interface.load_session_info()
+
+    interface.session_name = "M011_2023_04_07_16_00"
+    with pytest.raises(ValueError, match="not found"):
+        interface.load_session_info()
+
+
+@pytest.mark.processing
+def test_load_session_info_too_many_values(tmp_path):
+    interface = _make_interface(
+        tmp_path, PROFILE_WITH_SESSIONS + "M011_2023_04_08_16_00 22 bence extra\n"
+    )
+
+    with pytest.raises(ValueError, match="more values than the header"):
+        interface.load_session_info()
+
+    assert interface.session_info is None
@@ -0,0 +1,197 @@
+import datetime
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from test_data_validation import (
+    DIRECTORY_STRUCTURE_YAML_FOLDER,
+    _prepare_directory_structure,
+)
+from typer.testing import CliRunner
+
+from beneuro_data.cli import _check_session_dir, _prompt_for_data_types, app
+from beneuro_data.config import Config
+
+runner = CliRunner()
+
+
+def test_check_session_dir(tmp_path):
+    session_path = tmp_path / "M011_2023_04_04_16_00"
+    session_path.mkdir()
+    _check_session_dir(session_path)
+
+    with pytest.raises(ValueError, match="does not exist"):
+        _check_session_dir(tmp_path / "missing")
+
+    # a path under a file raises NotADirectoryError instead of FileNotFoundError
+    file_path = session_path / "comment.txt"
+    file_path.touch()
+    with pytest.raises(ValueError, match="does not exist"):
+        _check_session_dir(file_path / "M011_2023_04_04_16_00")
+
+    with pytest.raises(ValueError, match="must be a directory"):
+        _check_session_dir(file_path)
+
+
+@pytest.mark.parametrize("answer", ["bv", "b v", "b,v", " B, V "])
+def test_prompt_for_data_types_separators(monkeypatch, answer: str):
+    monkeypatch.setattr("sys.stdin", io.StringIO(answer + "\n"))
+
+    assert _prompt_for_data_types(None, None, None) == (True, False, True)
+
+
+def test_prompt_for_data_types_asks_again_for_unknown_letters(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("b x\ne\n"))
+
+    # behavior was given as an option, so only e and v can be chosen
+    assert _prompt_for_data_types(False, None, None) == (False, True, False)
+    assert "Unexpected letters: b, x" in capsys.readouterr().out
+
+
+@pytest.fixture
+def local_config(tmp_path, monkeypatch):
+    config = Config(LOCAL_PATH=tmp_path, REMOTE_PATH=tmp_path / "remote")
+    monkeypatch.setattr("beneuro_data.config._load_config", lambda: config)
+
+    return config
+
+
+def test_validate_sessions(tmp_path, local_config):
+    _prepare_directory_structure(
+        tmp_path, DIRECTORY_STRUCTURE_YAML_FOLDER, "M011_correct.yaml"
+    )
+    # a session without any behavioral data
+    (tmp_path / "raw" / "M011" / "M011_2023_04_10_12_00").mkdir()
+
+    result = runner.invoke(app, ["validate-sessions", "M011", "raw", "--ignore-ephys"])
+
+    assert result.exit_code == 0
+    assert "Problem with M011_2023_04_10_12_00" in result.stdout
+
+    # results are printed in the sessions' order, not in the order they finish in
+    lines = [line for line in result.stdout.splitlines() if line != ""]
+    assert lines[0] == "M011_2023_04_04_16_00 looking good."
+    assert lines[1].startswith("Problem with M011_2023_04_10_12_00")
+    assert lines[2] == "M011_2023_05_05_17_30 looking good."
+
+
+def test_validate_sessions_renames_only_when_asked(tmp_path, local_config):
+    _prepare_directory_structure(
+        tmp_path, DIRECTORY_STRUCTURE_YAML_FOLDER, "M011_wrong_video_filenames.yaml"
+    )
+    session_path = tmp_path / "raw" / "M011" / "M011_2023_04_04_16_00"
+    video_folder_path = session_path / "M011_2023_04_04_16_00_cameras"
+
+    result = runner.invoke(app, ["validate-sessions", "M011", "raw"])
+
+    assert "Problem with M011_2023_04_04_16_00" in result.stdout
+    # validating alone doesn't touch the files
+    assert (video_folder_path / "Camera_1.avi").exists()
+
+    result = runner.invoke(app, ["validate-sessions", "M011", "raw", "--rename-videos"])
+
+    assert "M011_2023_04_04_16_00 looking good." in result.stdout
+    assert not (video_folder_path / "Camera_1.avi").exists()
+    assert (video_folder_path / "M011_2023_04_04_16_00_camera_1.avi").exists()
+
+
+def test_validate_today(tmp_path, local_config, monkeypatch):
+    today = datetime.date.today().strftime("%Y_%m_%d")
+    raw_path = tmp_path / "raw"
+    for session_name in [
+        f"M011/M011_{today}_10_00",
+        f"M015/M015_{today}_09_00",
+        "M015/M015_2023_08_04_14_30",
+        f"treadmill-calibration/treadmill-calibration_{today}_08_00",
+    ]:
+        (raw_path / session_name).mkdir(parents=True)
+
+    validated_sessions = []
+
+    def fake_validate_raw_session(session_path, subject_name, **kwargs):
+        validated_sessions.append(os.path.basename(session_path))
+        if subject_name == "M015":
+            raise ValueError("Something is missing.")
+
+    monkeypatch.setattr(
+        "beneuro_data.data_validation.validate_raw_session", fake_validate_raw_session
+    )
+
+    result = runner.invoke(app, ["validate-today"])
+
+    assert result.exit_code == 0
+    assert sorted(validated_sessions) == [f"M011_{today}_10_00", f"M015_{today}_09_00"]
+    assert f"M011_{today}_10_00 looking good." in result.stdout
+    assert f"Problem with M015_{today}_09_00: Something is missing." in result.stdout
+
+
+def test_validate_sessions_fail_fast(tmp_path, local_config, monkeypatch):
+    subject_path = tmp_path / "raw" / "M011"
+    session_names = [f"M011_2023_04_0{day}_16_00" for day in range(1, 5)]
+    for session_name in session_names:
+        (subject_path / session_name).mkdir(parents=True)
+
+    # with a single worker the sessions are started one after the other
+    monkeypatch.setattr("beneuro_data.cli._MAX_VALIDATION_WORKERS", 1)
+
+    shutdown_with_cancel = threading.Event()
+    original_shutdown = ThreadPoolExecutor.shutdown
+
+    def recording_shutdown(self, wait=True, *, cancel_futures=False):
+        if cancel_futures:
+            shutdown_with_cancel.set()
+        original_shutdown(self, wait=wait, cancel_futures=cancel_futures)
+
+    monkeypatch.setattr(ThreadPoolExecutor, "shutdown", recording_shutdown)
+
+    validated_sessions = []
+
+    def fake_validate_raw_session(session_path, subject_name, **kwargs):
+        session_name = os.path.basename(session_path)
+        validated_sessions.append(session_name)
+        if session_name == session_names[0]:
+            raise ValueError("Something is missing.")
+
+        # keep the worker busy until the queued sessions are cancelled
+        shutdown_with_cancel.wait(timeout=10)
+
+    monkeypatch.setattr(
+        "beneuro_data.data_validation.validate_raw_session", fake_validate_raw_session
+    )
+
+    result = runner.invoke(app, ["validate-sessions", "M011", "raw", "--fail-fast"])
+
+    assert result.exit_code == 1
+    assert shutdown_with_cancel.is_set()
+    # the second session might have been started before the failure was seen
+    assert validated_sessions[0] == session_names[0]
+    assert session_names[2] not in validated_sessions
+    assert session_names[3] not in validated_sessions
+
+    assert (
+        result.stdout.strip() == f"Problem with {session_names[0]}: Something is missing."
+    )
+
+
+def test_dl_takes_subject_from_session_name(tmp_path, local_config, monkeypatch):
+    downloads = []
+    monkeypatch.setattr(
+        "beneuro_data.data_transfer.download_raw_session",
+        lambda **kwargs: downloads.append(kwargs),
+    )
+
+    # the subject's name is not always four characters long
+    result = runner.invoke(app, ["dl", "M1234_2024_03_12_18_45"])
+
+    assert result.exit_code == 0
+    assert downloads[0]["subject_name"] == "M1234"
+    assert downloads[0]["remote_session_path"] == (
+        local_config.REMOTE_PATH / "raw" / "M1234" / "M1234_2024_03_12_18_45"
+    )
+
+    result = runner.invoke(app, ["dl", "M1234"])
+
+    assert result.exit_code != 0
+    assert len(downloads) == 1
@@ -0,0 +1,81 @@
+from dataclasses import fields
+from pathlib import Path
+
+import pytest
+
+from beneuro_data.config import Config, _config_json, _load_config, _read_config
+
+
+def test_read_config(tmp_path: Path, monkeypatch):
+    for name in ("LOCAL_PATH", "REMOTE_PATH", "EXTENSIONS_TO_RENAME_AND_UPLOAD"):
+        monkeypatch.delenv(name, raising=False)
+
+    env_path = tmp_path / ".env"
+    env_path.write_text(
+        "LOCAL_PATH = /data/local\n"
+        "remote_path = /data/remote\n"
+        'EXTENSIONS_TO_RENAME_AND_UPLOAD = [".txt", ".md"]\n'
+    )
+
+    config = _read_config(env_path)
+
+    assert config.LOCAL_PATH == Path("/data/local")
+    assert config.REMOTE_PATH == Path("/data/remote")
+    assert config.EXTENSIONS_TO_RENAME_AND_UPLOAD == (".txt", ".md")
+    # with slots the defaults are not class attributes, so look them up on the fields
+    defaults = {field.name: field.default for field in fields(Config)}
+    assert config.WHITELISTED_FILES_IN_ROOT == defaults["WHITELISTED_FILES_IN_ROOT"]
+
+
+def test_read_config_environment_takes_precedence(tmp_path: Path, monkeypatch):
+    env_path = tmp_path / ".env"
+    env_path.write_text("LOCAL_PATH = /data/local\nREMOTE_PATH = /data/remote\n")
+
+    monkeypatch.setenv("REMOTE_PATH", "/mnt/remote")
+
+    assert _read_config(env_path).REMOTE_PATH == Path("/mnt/remote")
+
+
+def test_read_config_missing_setting(tmp_path: Path, monkeypatch):
+    env_path = tmp_path / ".env"
+    env_path.write_text("LOCAL_PATH = /data/local\n")
+
+    monkeypatch.delenv("REMOTE_PATH", raising=False)
+
+    with pytest.raises(ValueError, match="REMOTE_PATH not set"):
+        _read_config(env_path)
+
+
+@pytest.mark.parametrize(
+    "value",
+    ['"treadmill-calibration"', "treadmill-calibration", '["a", 1]'],
+    ids=["json_string", "invalid_json", "non_string_item"],
+)
+def test_read_config_tuple_setting_must_be_list_of_strings(
+    tmp_path: Path, monkeypatch, value: str
+):
+    # set through the environment, so that dotenv's quote handling doesn't change the value
+    monkeypatch.setenv("IGNORED_SUBJECT_LEVEL_DIRS", value)
+
+    env_path = tmp_path / ".env"
+    env_path.write_text("LOCAL_PATH = /data/local\nREMOTE_PATH = /data/remote\n")
+
+    with pytest.raises(
+        ValueError, match="IGNORED_SUBJECT_LEVEL_DIRS must be a JSON list of strings"
+    ):
+        _read_config(env_path)
+
+
+def test_load_config_sees_environment_changes(tmp_path: Path, monkeypatch):
+    env_path = tmp_path / ".env"
+    env_path.write_text("LOCAL_PATH = /data/local\nREMOTE_PATH = /data/remote\n")
+    monkeypatch.setattr("beneuro_data.config._ENV_PATH", env_path)
+    monkeypatch.delenv("REMOTE_PATH", raising=False)
+
+    assert _load_config().REMOTE_PATH == Path("/data/remote")
+
+    # the .env file is unchanged, so only the environment can invalidate the cache
+    monkeypatch.setenv("REMOTE_PATH", "/mnt/remote")
+
+    assert _load_config().REMOTE_PATH == Path("/mnt/remote")
+    assert '"REMOTE_PATH": "/mnt/remote"' in _config_json()
@@ -8,7 +8,14 @@ import pytest
 from generate_directory_structure_test_cases import create_directory_structure_from_dict
 from ruamel.yaml import YAML
 
-from beneuro_data.data_validation import WrongNumberOfFilesError, validate_raw_session
+from beneuro_data.data_validation import (
+    WrongNumberOfFilesError,
+    _folder_prefix,
+    _get_ap_stream_names_of_probes,
+    _list_files_in_session,
+    validate_raw_session,
+    validate_session_path,
+)
 
 TEST_DIR_PATH = os.path.dirname(__file__)
 DIRECTORY_STRUCTURE_YAML_FOLDER = os.path.join(
@@ -258,3 +265,132 @@ def test_num_valid_sessions(tmp_path, test_case: NumValidSessionsTestCase):
         tmp_path, NUM_VALID_SESSIONS_YAML_FOLDER, test_case.yaml_name
     )
     test_case.run_test(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "yaml_name", ["M011_correct.yaml", "M011_trajectory_and_channel_map_in_probe.yaml"]
+)
+def test_list_files_in_session_matches_glob(tmp_path, yaml_name: str):
+    _prepare_directory_structure(tmp_path, DIRECTORY_STRUCTURE_YAML_FOLDER, yaml_name)
+
+    for session_path in (tmp_path / "raw" / "M011").iterdir():
+        expected_files = [p for p in session_path.glob("**/*") if p.is_file()]
+
+        assert sorted(_list_files_in_session(session_path)) == sorted(expected_files)
+
+
+def test_get_ap_stream_names_of_probes(tmp_path):
+    _prepare_directory_structure(
+        tmp_path, DIRECTORY_STRUCTURE_YAML_FOLDER, "M011_correct.yaml"
+    )
+    session_path = tmp_path / "raw" / "M011" / "M011_2023_04_04_16_00"
+
+    assert _get_ap_stream_names_of_probes(session_path, ["imec0"]) == ["imec0.ap"]
+
+    # all missing probes are reported at once
+    with pytest.raises(ValueError, match="No file found for imec1.ap, imec2.ap"):
+        _get_ap_stream_names_of_probes(session_path, ["imec0", "imec1", "imec2"])
+
+    with pytest.raises(ValueError, match="Duplicate probe names"):
+        _get_ap_stream_names_of_probes(session_path, ["imec0", "imec0"])
+
+    # files outside the usual SpikeGLX folder structure are still found
+    (session_path / "somewhere_else").mkdir()
+    (session_path / "somewhere_else" / "recording.imec1.ap.bin").touch()
+
+    assert _get_ap_stream_names_of_probes(session_path, ["imec0", "imec1"]) == [
+        "imec0.ap",
+        "imec1.ap",
+    ]
+
+
+def test_folder_prefix_matches_is_relative_to(tmp_path):
+    folder_path = tmp_path / "M011_2023_04_04_16_00_g1"
+    paths = [
+        folder_path / "a.bin",
+        folder_path / "probe" / "a.bin",
+        tmp_path / "M011_2023_04_04_16_00_g10" / "a.bin",
+        tmp_path / "a.bin",
+    ]
+
+    prefix = _folder_prefix(folder_path)
+    for path in paths:
+        assert os.path.normcase(path).startswith(prefix) == path.is_relative_to(folder_path)
+
+
+def test_validate_raw_session_accepts_str_path(tmp_path):
+    _prepare_directory_structure(
+        tmp_path, DIRECTORY_STRUCTURE_YAML_FOLDER, "M011_correct.yaml"
+    )
+
+    with os.scandir(tmp_path / "raw" / "M011") as entries:
+        for entry in entries:
+            validate_raw_session(
+                entry.path,
+                "M011",
+                True,
+                True,
+                True,
+                WHITELISTED_FILES_IN_ROOT,
+                EXTENSIONS_TO_RENAME_AND_UPLOAD,
+            )
+
+
+@pytest.mark.parametrize(
+    ("filename", "error_message"),
+    [
+        ("M011_2023_04_04_16_00_camera_6.AVI", r"Found .avi file in unexpected location"),
+        ("M011_2023_04_04_16_00_g1_t0.imec0.AP.BIN", r"not in any known recording folders"),
+    ],
+)
+def test_validate_raw_session_upper_case_extensions_on_windows(
+    tmp_path, monkeypatch, filename: str, error_message: str
+):
+    _prepare_directory_structure(
+        tmp_path, DIRECTORY_STRUCTURE_YAML_FOLDER, "M011_correct.yaml"
+    )
+    session_path = tmp_path / "raw" / "M011" / "M011_2023_04_04_16_00"
+    (session_path / filename).touch()
+
+    # normcase lowercases paths on Windows, where globbing used to find these files
+    monkeypatch.setattr(os.path, "normcase", lambda path: os.fspath(path).lower())
+
+    with pytest.raises(ValueError, match=error_message):
+        validate_raw_session(
+            session_path,
+            "M011",
+            False,
+            True,
+            True,
+            WHITELISTED_FILES_IN_ROOT,
+            EXTENSIONS_TO_RENAME_AND_UPLOAD,
+        )
+
+
+def test_validate_raw_session_checks_session_path_once(tmp_path, monkeypatch):
+    _prepare_directory_structure(
+        tmp_path, DIRECTORY_STRUCTURE_YAML_FOLDER, "M011_correct.yaml"
+    )
+
+    checked_paths = []
+
+    def counting_validate_session_path(session_path, subject_name):
+        checked_paths.append(session_path)
+        return validate_session_path(session_path, subject_name)
+
+    monkeypatch.setattr(
+        "beneuro_data.data_validation.validate_session_path",
+        counting_validate_session_path,
+    )
+
+    validate_raw_session(
+        tmp_path / "raw" / "M011" / "M011_2023_04_04_16_00",
+        "M011",
+        True,
+        True,
+        True,
+        WHITELISTED_FILES_IN_ROOT,
+        EXTENSIONS_TO_RENAME_AND_UPLOAD,
+    )
+
+    assert len(checked_paths) == 1
@@ -11,6 +11,7 @@ from test_data_validation import (
 )
 
 from beneuro_data.extra_file_handling import (
+    _find_whitelisted_files_in_root,
     _rename_extra_files_with_extension,
     _rename_whitelisted_files_in_root,
 )
@@ -174,3 +175,21 @@ def test_rename_extra_files_with_extension(
         with pytest.raises(test_case.expected_error):
             for extension in EXTENSIONS_TO_RENAME_AND_UPLOAD:
                 _rename_extra_files_with_extension(session_path, extension)
+
+
+@pytest.mark.parametrize("case_insensitive", [True, False])
+def test_find_whitelisted_files_in_root_case(tmp_path, monkeypatch, case_insensitive: bool):
+    session_path = tmp_path / "M011_2023_04_04_16_00"
+    session_path.mkdir()
+    (session_path / "Comment.txt").touch()
+
+    # normcase lowercases names on Windows and leaves them unchanged elsewhere
+    if case_insensitive:
+        monkeypatch.setattr(os.path, "normcase", lambda path: os.fspath(path).lower())
+
+    files_found = _find_whitelisted_files_in_root(session_path, WHITELISTED_FILES_IN_ROOT)
+
+    if case_insensitive:
+        assert files_found == [session_path / "comment.txt"]
+    else:
+        assert files_found == []
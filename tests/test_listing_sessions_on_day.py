@@ -105,5 +105,6 @@ def test_list_all_sessions_on_day(
         raw_dir_path, test_case.day, test_case.ignored_subject_level_dirs
     )
 
+    assert isinstance(sessions_on_day, list)
     # they don't have to be in the same order, so test for equality of sets
     assert set(sessions_on_day) == set(test_case.sessions_on_day)